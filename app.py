@@ -10,7 +10,9 @@ Includes integrated Bluetooth audio support.
 
 from flask import Flask, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
+import copy
 import json
+import logging
 import time
 import threading
 from datetime import datetime
@@ -60,15 +62,35 @@ walle_state = {
     'solar_power': 1.2,
     'time_to_full': 2.5,
     'connected': False,
-    'last_update': datetime.now().isoformat()
+    'last_update_ms': int(time.monotonic() * 1000)
 }
 
+# Guards walle_state against torn reads while it is being broadcast
+state_lock = threading.RLock()
+
+
+def snapshot_walle_state():
+    """Return a consistent deep copy of walle_state for broadcasting"""
+    with state_lock:
+        return copy.deepcopy(walle_state)
+
 # Initialize hardware controllers
 arduino = None
 audio = None
 display = None
 battery = None
 
+# Sound names routed through play_wall_e_emotion by the 'sound' command
+EMOTION_SOUNDS = frozenset(['happy', 'sad', 'curious', 'worried', 'excited', 'greeting'])
+
+# Bound once in initialize_hardware so command dispatch skips attribute probing
+audio_play_emotion = None
+
+# Latest requested angle per servo, flushed to the Arduino by servo_flush_thread
+SERVO_FLUSH_INTERVAL = 0.02  # 20ms coalescing window for slider drags
+pending_servo_positions = {}
+pending_servo_lock = threading.Lock()
+
 
 # ESP32-CAM Discovery and Connection Functions
 def discover_esp32_cam():
@@ -174,12 +196,14 @@ def check_camera_connection():
 
 def initialize_hardware():
     """Initialize all Wall-E hardware components"""
-    global arduino, audio, display, battery
+    global arduino, audio, display, battery, audio_play_emotion
 
     try:
         # Initialize Arduino communication
         arduino = ArduinoController()
-        walle_state['connected'] = arduino.is_connected()
+        connected = arduino.is_connected()
+        with state_lock:
+            walle_state['connected'] = connected
         print("✓ Arduino controller initialized")
 
         os.makedirs("static/captures", exist_ok=True)
@@ -190,6 +214,7 @@ def initialize_hardware():
     try:
         # Initialize audio system with Bluetooth support
         audio = AudioSystem()
+        audio_play_emotion = getattr(audio, 'play_wall_e_emotion', None) or audio.play_sound
         print("✓ Audio system initialized")
 
         # Set up Bluetooth status callbacks
@@ -207,8 +232,8 @@ def initialize_hardware():
         print(f"✗ Display controller failed: {e}")
 
     try:
-        # Initialize battery monitor
-        battery = BatteryMonitor()
+        # Initialize battery monitor on the same I2C bus as the display
+        battery = BatteryMonitor(i2c=display.i2c if display else None)
         print("✓ Battery monitor initialized")
 
         # Set up battery callbacks
@@ -278,13 +303,17 @@ def get_status():
     """Get current Wall-E status"""
     # Update connection status
     if arduino:
-        walle_state['connected'] = arduino.is_connected()
+        connected = arduino.is_connected()
+        with state_lock:
+            walle_state['connected'] = connected
 
     # Add audio system info
     if audio and hasattr(audio, 'get_audio_info'):
-        walle_state['audio_info'] = audio.get_audio_info()
+        audio_info = audio.get_audio_info()
+        with state_lock:
+            walle_state['audio_info'] = audio_info
 
-    return jsonify(walle_state)
+    return jsonify(snapshot_walle_state())
 
 
 @app.route('/api/command', methods=['POST'])
@@ -298,8 +327,9 @@ def send_command():
         result = process_command(command, params)
 
         # Update state and broadcast to all clients
-        walle_state['last_update'] = datetime.now().isoformat()
-        socketio.emit('status_update', walle_state)
+        with state_lock:
+            walle_state['last_update_ms'] = int(time.monotonic() * 1000)
+        socketio.emit('status_update', snapshot_walle_state())
 
         return jsonify({
             'success': True,
@@ -715,7 +745,8 @@ def process_detection_event(event, details):
 
     if event == 'person_detected':
         print("👤 Person detected - Wall-E responding...")
-        walle_state['mode'] = 'person_detected'
+        with state_lock:
+            walle_state['mode'] = 'person_detected'
 
         # Play greeting sound
         if audio:
@@ -734,7 +765,8 @@ def process_detection_event(event, details):
 
     elif event == 'wave_detected':
         print("👋 Wave detected - Wall-E waving back!")
-        walle_state['mode'] = 'greeting'
+        with state_lock:
+            walle_state['mode'] = 'greeting'
 
         # Play happy greeting sound
         if audio:
@@ -768,7 +800,8 @@ def process_detection_event(event, details):
 
     elif event == 'person_left':
         print("👤 Person left - Wall-E returning to idle")
-        walle_state['mode'] = 'idle'
+        with state_lock:
+            walle_state['mode'] = 'idle'
 
         # Play sad/goodbye sound
         if audio:
@@ -1358,7 +1391,8 @@ def process_command(command, params):
     global walle_state
 
     if command == 'wake_up':
-        walle_state['mode'] = 'greeting'
+        with state_lock:
+            walle_state['mode'] = 'greeting'
         if arduino:
             arduino.send_command('w')
         if audio:
@@ -1366,7 +1400,8 @@ def process_command(command, params):
         return "Wall-E is waking up!"
 
     elif command == 'explore':
-        walle_state['mode'] = 'exploring'
+        with state_lock:
+            walle_state['mode'] = 'exploring'
         if arduino:
             arduino.send_command('e')
         if audio:
@@ -1374,7 +1409,8 @@ def process_command(command, params):
         return "Wall-E is exploring!"
 
     elif command == 'greeting':
-        walle_state['mode'] = 'greeting'
+        with state_lock:
+            walle_state['mode'] = 'greeting'
         if arduino:
             arduino.send_command('g')
         if audio:
@@ -1382,10 +1418,14 @@ def process_command(command, params):
         return "Wall-E says hello!"
 
     elif command == 'stop':
-        walle_state['mode'] = 'idle'
-        walle_state['motors']['left_speed'] = 0
-        walle_state['motors']['right_speed'] = 0
+        with state_lock:
+            walle_state['mode'] = 'idle'
+            walle_state['motors']['left_speed'] = 0
+            walle_state['motors']['right_speed'] = 0
         if arduino:
+            # Drop queued slider moves so none is sent after the stop
+            with pending_servo_lock:
+                pending_servo_positions.clear()
             arduino.stop_all()
         if audio:
             audio.play_sound('beep')
@@ -1393,47 +1433,40 @@ def process_command(command, params):
 
     elif command == 'move':
         direction = params.get('direction')
-        walle_state['mode'] = 'moving'
 
         # Map directions to motor speeds
         speed = 150  # Default speed
-        if direction == 'forward':
-            walle_state['motors']['left_speed'] = speed
-            walle_state['motors']['right_speed'] = speed
-            if arduino:
-                arduino.set_motor_speeds(speed, speed)
-        elif direction == 'backward':
-            walle_state['motors']['left_speed'] = -speed
-            walle_state['motors']['right_speed'] = -speed
-            if arduino:
-                arduino.set_motor_speeds(-speed, -speed)
-        elif direction == 'left':
-            walle_state['motors']['left_speed'] = -speed // 2
-            walle_state['motors']['right_speed'] = speed // 2
-            if arduino:
-                arduino.set_motor_speeds(-speed // 2, speed // 2)
-        elif direction == 'right':
-            walle_state['motors']['left_speed'] = speed // 2
-            walle_state['motors']['right_speed'] = -speed // 2
-            if arduino:
-                arduino.set_motor_speeds(speed // 2, -speed // 2)
+        motor_speeds = {
+            'forward': (speed, speed),
+            'backward': (-speed, -speed),
+            'left': (-speed // 2, speed // 2),
+            'right': (speed // 2, -speed // 2),
+        }.get(direction)
+
+        with state_lock:
+            walle_state['mode'] = 'moving'
+            if motor_speeds:
+                walle_state['motors']['left_speed'], walle_state['motors']['right_speed'] = motor_speeds
+        if motor_speeds and arduino:
+            arduino.set_motor_speeds(*motor_speeds)
 
         return f"Moving {direction}"
 
     elif command == 'servo':
         servo = params.get('servo')
         angle = params.get('angle', 90)
-        if arduino:
-            arduino.set_servo(servo, angle)
-        walle_state['servo_positions'][servo] = angle
+        # Queued like slider moves so an older pending value cannot override it
+        with pending_servo_lock:
+            pending_servo_positions[servo] = angle
+        with state_lock:
+            walle_state['servo_positions'][servo] = angle
         return f"Set {servo} to {angle}°"
 
     elif command == 'sound':
         sound = params.get('sound')
         if audio:
-            if hasattr(audio, 'play_wall_e_emotion') and sound in ['happy', 'sad', 'curious', 'worried', 'excited',
-                                                                   'greeting']:
-                audio.play_wall_e_emotion(sound)
+            if sound in EMOTION_SOUNDS:
+                audio_play_emotion(sound)
             else:
                 audio.play_sound(sound)
         return f"Playing sound: {sound}"
@@ -1447,7 +1480,13 @@ def process_command(command, params):
 def handle_connect():
     """Handle client connection"""
     print(f"Client connected: {request.sid}")
-    emit('status_update', walle_state)
+
+    # One-time offset so the client can turn last_update_ms into wall-clock time
+    emit('clock_sync', {
+        'wall_time_ms': int(time.time() * 1000),
+        'monotonic_ms': int(time.monotonic() * 1000)
+    })
+    emit('status_update', snapshot_walle_state())
 
     # Send initial Bluetooth status if available
     if audio and hasattr(audio, 'get_bluetooth_status'):
@@ -1475,26 +1514,33 @@ def handle_manual_control(data):
             if arduino:
                 arduino.set_motor_speeds(left_speed, right_speed)
 
-            walle_state['motors']['left_speed'] = left_speed
-            walle_state['motors']['right_speed'] = right_speed
+            with state_lock:
+                walle_state['motors']['left_speed'] = left_speed
+                walle_state['motors']['right_speed'] = right_speed
 
         elif command.startswith('servo_'):
             servo_name = command.replace('servo_', '')
-            if arduino:
-                arduino.set_servo(servo_name, value)
-            walle_state['servo_positions'][servo_name] = value
+            # Only the latest value per servo is sent; see servo_flush_thread
+            with pending_servo_lock:
+                pending_servo_positions[servo_name] = value
+            with state_lock:
+                walle_state['servo_positions'][servo_name] = value
 
         elif command == 'emergency_stop':
-            walle_state['mode'] = 'idle'
-            walle_state['motors']['left_speed'] = 0
-            walle_state['motors']['right_speed'] = 0
+            with state_lock:
+                walle_state['mode'] = 'idle'
+                walle_state['motors']['left_speed'] = 0
+                walle_state['motors']['right_speed'] = 0
             if arduino:
+                # Drop queued slider moves so none is sent after the stop
+                with pending_servo_lock:
+                    pending_servo_positions.clear()
                 arduino.stop_all()
             if audio:
                 audio.play_wall_e_emotion('worried')
 
         # Broadcast update to all clients
-        emit('status_update', walle_state, broadcast=True)
+        emit('status_update', snapshot_walle_state(), broadcast=True)
 
     except Exception as e:
         emit('error', {'message': str(e)})
@@ -1504,28 +1550,41 @@ def sensor_update_thread():
     """Background thread to update sensor readings"""
     while True:
         try:
-            if arduino and arduino.is_connected():
+            sensors = None
+            connected = bool(arduino and arduino.is_connected())
+            if connected:
                 # Get sensor readings from Arduino
                 sensors = arduino.get_sensor_readings()
-                walle_state['sensors'].update(sensors)
-                walle_state['connected'] = True
-            else:
-                walle_state['connected'] = False
 
-            # Update battery level
+            battery_status = None
             if battery:
+                # Battery sampling is paced by its own update_interval. The ADC
+                # converts continuously in the background, so this only fetches
+                # the latest result and never waits on a conversion.
+                battery.tick()
                 battery_status = battery.get_battery_status()
-                walle_state['battery_level'] = battery_status['percentage']
-                walle_state['battery_voltage'] = battery_status['voltage']
-                walle_state['battery_status'] = battery_status['status']
 
-            # Update display
+            # Apply all updates for this tick in one go, then take a single snapshot
+            with state_lock:
+                if sensors is not None:
+                    walle_state['sensors'].update(sensors)
+                walle_state['connected'] = connected
+
+                # Update battery level
+                if battery_status:
+                    walle_state['battery_level'] = battery_status['percentage']
+                    walle_state['battery_voltage'] = battery_status['voltage']
+                    walle_state['battery_status'] = battery_status['status']
+
+                walle_state['last_update_ms'] = int(time.monotonic() * 1000)
+                snapshot = copy.deepcopy(walle_state)
+
+            # Hand the snapshot to the display's render thread (latest wins)
             if display and display.available:
-                display.update_status(walle_state)
+                display.mark_dirty(snapshot)
 
             # Broadcast to all connected clients
-            walle_state['last_update'] = datetime.now().isoformat()
-            socketio.emit('status_update', walle_state)
+            socketio.emit('status_update', snapshot)
 
         except Exception as e:
             print(f"Sensor update error: {e}")
@@ -1533,6 +1592,24 @@ def sensor_update_thread():
         time.sleep(0.5)  # Update every 500ms
 
 
+def servo_flush_thread():
+    """Background thread sending the latest pending servo positions to the Arduino"""
+    while True:
+        try:
+            with pending_servo_lock:
+                pending = dict(pending_servo_positions)
+                pending_servo_positions.clear()
+
+            if arduino:
+                for servo_name, angle in pending.items():
+                    arduino.set_servo(servo_name, angle)
+
+        except Exception as e:
+            print(f"Servo flush error: {e}")
+
+        time.sleep(SERVO_FLUSH_INTERVAL)
+
+
 def play_startup_sequence():
     """Play Wall-E startup sequence"""
     time.sleep(2)  # Wait for system to stabilize
@@ -1562,6 +1639,8 @@ def cleanup_on_exit():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
     print("=== Wall-E Control System Starting ===")
     print("Repository: https://github.com/Vladdudu12/wall-e-control")
     print(f"Access at: http://wall-e.local:5000")
@@ -1575,6 +1654,9 @@ if __name__ == '__main__':
     sensor_thread = threading.Thread(target=sensor_update_thread, daemon=True)
     sensor_thread.start()
 
+    servo_thread = threading.Thread(target=servo_flush_thread, daemon=True)
+    servo_thread.start()
+
     # Play startup sequence
     startup_thread = threading.Thread(target=play_startup_sequence, daemon=True)
     startup_thread.start()
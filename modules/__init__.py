@@ -7,6 +7,7 @@ This package contains all the hardware interface modules for the Wall-E robot:
 - audio_system: Sound and audio management  
 - display_controller: OLED display control
 - battery_monitor: Battery level monitoring
+- i2c_bus: Shared I2C bus settings
 
 Author: Vladdudu12
 Repository: https://github.com/Vladdudu12/wall-e-control
@@ -18,5 +19,6 @@ __all__ = [
     "arduino_controller",
     "audio_system", 
     "display_controller",
-    "battery_monitor"
+    "battery_monitor",
+    "i2c_bus"
 ]
\ No newline at end of file
@@ -7,9 +7,12 @@ Handles serial communication with Arduino for motor, servo, and sensor control
 import serial
 import time
 import json
+import logging
 import threading
 from typing import Dict, Optional, Tuple
 
+log = logging.getLogger(__name__)
+
 class ArduinoController:
     def __init__(self, port='/dev/ttyACM0', baudrate=9600, timeout=2):
         """
@@ -98,17 +101,17 @@ class ArduinoController:
             bool: True if sent successfully
         """
         if not self.is_connected():
-            print("Arduino not connected")
+            log.warning("Arduino not connected")
             return False
         
         try:
             command_str = f"{command}\n"
             self.serial_connection.write(command_str.encode())
-            print(f"Sent to Arduino: {command}")
+            log.debug("Sent to Arduino: %s", command)
             return True
             
         except Exception as e:
-            print(f"Error sending command: {e}")
+            log.error("Error sending command: %s", e)
             self.connected = False
             return False
     
@@ -135,7 +138,7 @@ class ArduinoController:
         }
         
         if servo_name not in servo_map:
-            print(f"Unknown servo: {servo_name}")
+            log.warning("Unknown servo: %s", servo_name)
             return False
         
         channel = servo_map[servo_name]
@@ -145,11 +148,11 @@ class ArduinoController:
             # Send servo command: "SERVO,channel,angle"
             command = f"SERVO,{channel},{angle}\n"
             self.serial_connection.write(command.encode())
-            print(f"Set {servo_name} (ch{channel}) to {angle}°")
+            log.debug("Set %s (ch%s) to %s°", servo_name, channel, angle)
             return True
             
         except Exception as e:
-            print(f"Error setting servo: {e}")
+            log.error("Error setting servo: %s", e)
             return False
     
     def set_motor_speeds(self, left_speed: int, right_speed: int) -> bool:
@@ -173,11 +176,11 @@ class ArduinoController:
         try:
             command = f"MOTOR,{left_speed},{right_speed}\n"
             self.serial_connection.write(command.encode())
-            print(f"Set motors: L={left_speed}, R={right_speed}")
+            log.debug("Set motors: L=%s, R=%s", left_speed, right_speed)
             return True
             
         except Exception as e:
-            print(f"Error setting motors: {e}")
+            log.error("Error setting motors: %s", e)
             return False
     
     def get_sensor_readings(self) -> Dict[str, float]:
@@ -196,7 +199,7 @@ class ArduinoController:
             return self.last_sensor_reading.copy()
             
         except Exception as e:
-            print(f"Error reading sensors: {e}")
+            log.error("Error reading sensors: %s", e)
             return {'front': 0, 'left': 0, 'right': 0}
     
     def _read_responses(self):
@@ -209,7 +212,7 @@ class ArduinoController:
                         self._parse_response(line)
                         
             except Exception as e:
-                print(f"Error reading Arduino response: {e}")
+                log.error("Error reading Arduino response: %s", e)
                 self.connected = False
                 break
             
@@ -232,18 +235,18 @@ class ArduinoController:
                     
             elif response.startswith("STATUS:"):
                 # Parse status updates
-                print(f"Arduino status: {response}")
+                log.info("Arduino status: %s", response)
                 
             elif response.startswith("ERROR:"):
                 # Handle errors
-                print(f"Arduino error: {response}")
+                log.warning("Arduino error: %s", response)
                 
             else:
                 # General Arduino output
-                print(f"Arduino: {response}")
+                log.debug("Arduino: %s", response)
                 
         except Exception as e:
-            print(f"Error parsing Arduino response: {e}")
+            log.error("Error parsing Arduino response: %s", e)
     
     def reset_arduino(self) -> bool:
         """Reset Arduino to neutral state"""
@@ -4,23 +4,36 @@ Battery Monitor Module for Wall-E
 Monitors 12V LiPO battery voltage and provides battery level information
 """
 
+import math
 import time
-import threading
 from typing import Dict, Optional, Callable
 
+import numpy as np
+
+try:
+    from modules.i2c_bus import open_i2c
+except ImportError:
+    # Run directly as a script (python modules/battery_monitor.py)
+    from i2c_bus import open_i2c
+
 try:
     import board
     import busio
     import adafruit_ads1x15.ads1015 as ADS
+    from adafruit_ads1x15.ads1x15 import Mode
     from adafruit_ads1x15.analog_in import AnalogIn
     ADC_AVAILABLE = True
 except ImportError:
     print("ADC libraries not available, using voltage divider simulation")
     ADC_AVAILABLE = False
 
+# The charging trend must cross +/- this many volts to change is_charging;
+# inside the band the previous state is kept so noise cannot flip it
+CHARGE_TREND_THRESHOLD = 0.005
+
 class BatteryMonitor:
     def __init__(self, voltage_pin=None, min_voltage=9.6, max_voltage=12.6, 
-                 voltage_divider_ratio=3.0, update_interval=5.0):
+                 voltage_divider_ratio=3.0, update_interval=5.0, i2c=None):
         """
         Initialize battery monitor
         
@@ -30,6 +43,7 @@ class BatteryMonitor:
             max_voltage: Maximum battery voltage (full)
             voltage_divider_ratio: Voltage divider ratio (12V -> 4V for Pi)
             update_interval: How often to update readings (seconds)
+            i2c: Existing I2C bus to share (e.g. the display's); created if None
         """
         self.voltage_pin = voltage_pin
         self.min_voltage = min_voltage
@@ -37,46 +51,71 @@ class BatteryMonitor:
         self.voltage_divider_ratio = voltage_divider_ratio
         self.update_interval = update_interval
         
+        # Quantized voltage -> percentage lookup table
+        self._build_percentage_lut()
+        
         # Current readings
         self.current_voltage = 0.0
         self.battery_percentage = 100
         self.is_charging = False
         self.low_battery_warning = False
         
+        # Exponential moving averages (O(1) noise filtering, no history buffer)
+        self._ema_voltage = None
+        self._tau = 15.0  # seconds, voltage smoothing time constant
+        self._trend_ema = 0.0
+        self._trend_tau = 60.0  # seconds, charging trend time constant
+        
         # Callbacks
         self.low_battery_callback = None
         self.critical_battery_callback = None
         
-        # Monitoring state
-        self.monitoring = False
-        self.monitor_thread = None
+        # Monitoring state (driven by the caller's loop via tick())
+        self._next_update = 0.0
         self.adc = None
         self.analog_in = None
+        self.i2c = i2c
         
         # Initialize ADC if available
         self._initialize_adc()
         
-        # Start monitoring
-        self.start_monitoring()
-        
         print("✓ Battery monitor initialized")
     
     def _initialize_adc(self):
-        """Initialize ADC for voltage reading"""
+        """
+        Initialize ADC for voltage reading
+        
+        Binds read_voltage to the ADC or simulation reader once, so the
+        per-read path carries no availability check.
+        """
+        self.read_voltage = self._read_voltage_sim
+        
         if not ADC_AVAILABLE:
             print("Using simulated battery readings (ADC not available)")
             return
         
         try:
-            # Create I2C bus
-            i2c = busio.I2C(board.SCL, board.SDA)
+            # Create I2C bus unless one is shared with us
+            if self.i2c is None:
+                self.i2c = open_i2c()
             
             # Create ADC object
-            self.adc = ADS.ADS1015(i2c)
+            self.adc = ADS.ADS1015(self.i2c)
+            
+            # Continuous conversion at max rate so back-to-back reads skip config writes
+            self.adc.mode = Mode.CONTINUOUS
+            self.adc.data_rate = 3300
             
             # Create analog input channel
             self.analog_in = AnalogIn(self.adc, ADS.P0)  # Using channel 0
             
+            # Prime the channel: the first read writes the config register and
+            # waits for a conversion. After this the ADC keeps converting in the
+            # background, so later reads overlap with our own processing and
+            # only fetch the latest result.
+            _ = self.analog_in.voltage
+            
+            self.read_voltage = self._read_voltage_adc
             print("✓ ADC initialized for battery monitoring")
             
         except Exception as e:
@@ -84,33 +123,53 @@ class BatteryMonitor:
             self.adc = None
             self.analog_in = None
     
-    def read_voltage(self) -> float:
+    def _read_voltage_adc(self) -> float:
         """
-        Read current battery voltage
+        Read current battery voltage from the ADC
         
         Returns:
             float: Battery voltage in volts
         """
-        if self.analog_in:
-            try:
-                # Read voltage from ADC
-                adc_voltage = self.analog_in.voltage
-                
-                # Convert back to battery voltage using voltage divider ratio
-                battery_voltage = adc_voltage * self.voltage_divider_ratio
-                
-                return battery_voltage
-                
-            except Exception as e:
-                print(f"Error reading voltage: {e}")
-                return 0.0
-        else:
-            # Simulate battery voltage (for testing without ADC)
-            # Slowly decrease over time
-            base_voltage = 12.0
-            time_factor = (time.time() % 3600) / 3600  # 1 hour cycle
-            simulated_voltage = base_voltage - (time_factor * 2.0)  # 12V to 10V over 1 hour
-            return max(9.5, simulated_voltage)
+        try:
+            # Convert back to battery voltage using voltage divider ratio
+            return self.analog_in.voltage * self.voltage_divider_ratio
+            
+        except Exception as e:
+            print(f"Error reading voltage: {e}")
+            return 0.0
+    
+    def _read_voltage_sim(self) -> float:
+        """
+        Simulate battery voltage (for testing without ADC)
+        
+        Returns:
+            float: Battery voltage in volts
+        """
+        # Slowly decrease over time
+        base_voltage = 12.0
+        time_factor = (time.time() % 3600) / 3600  # 1 hour cycle
+        simulated_voltage = base_voltage - (time_factor * 2.0)  # 12V to 10V over 1 hour
+        return max(9.5, simulated_voltage)
+    
+    def _build_percentage_lut(self):
+        """Precompute a 256-bin voltage -> percentage table for the current range"""
+        bins = np.linspace(self.min_voltage, self.max_voltage, 256)
+        lut = np.clip((bins - self.min_voltage) / (self.max_voltage - self.min_voltage) * 100, 0, 100)
+        self._pct_lut = tuple(lut.astype(np.uint8).tolist())
+        self._pct_scale = 255.0 / (self.max_voltage - self.min_voltage)
+        self._pct_min = self.min_voltage
+    
+    def set_voltage_range(self, min_voltage: float, max_voltage: float):
+        """
+        Update the empty/full voltage range
+        
+        Args:
+            min_voltage: Minimum battery voltage (empty)
+            max_voltage: Maximum battery voltage (full)
+        """
+        self.min_voltage = min_voltage
+        self.max_voltage = max_voltage
+        self._build_percentage_lut()
     
     def voltage_to_percentage(self, voltage: float) -> int:
         """
@@ -122,15 +181,13 @@ class BatteryMonitor:
         Returns:
             int: Battery percentage (0-100)
         """
-        if voltage <= self.min_voltage:
-            return 0
-        elif voltage >= self.max_voltage:
-            return 100
-        else:
-            # Linear interpolation
-            percentage = ((voltage - self.min_voltage) / 
-                         (self.max_voltage - self.min_voltage)) * 100
-            return int(percentage)
+        # One multiply and a table lookup; out-of-range voltages clamp to 0/100
+        idx = int((voltage - self._pct_min) * self._pct_scale)
+        if idx <= 0:
+            return self._pct_lut[0]
+        if idx >= 255:
+            return self._pct_lut[255]
+        return self._pct_lut[idx]
     
     def get_battery_percentage(self) -> int:
         """Get current battery percentage"""
@@ -188,19 +245,32 @@ class BatteryMonitor:
     
     def _update_battery_readings(self):
         """Update battery readings and check for warnings"""
-        # Read current voltage
-        self.current_voltage = self.read_voltage()
+        # Read current voltage; a failed ADC read reports 0.0 and is skipped
+        # rather than averaged in, which would drag the level down
+        raw = self.read_voltage()
+        if raw <= 0.0:
+            return
+        
+        # Smooth with an EMA: v += alpha * (raw - v), alpha = 1 - exp(-dt/tau)
+        if self._ema_voltage is None:
+            self._ema_voltage = raw
+        else:
+            alpha = 1.0 - math.exp(-self.update_interval / self._tau)
+            self._ema_voltage += alpha * (raw - self._ema_voltage)
+            
+            # Detect charging from the slower-averaged raw - EMA, with hysteresis
+            trend_alpha = 1.0 - math.exp(-self.update_interval / self._trend_tau)
+            self._trend_ema += trend_alpha * ((raw - self._ema_voltage) - self._trend_ema)
+            if self._trend_ema > CHARGE_TREND_THRESHOLD:
+                self.is_charging = True
+            elif self._trend_ema < -CHARGE_TREND_THRESHOLD:
+                self.is_charging = False
+        
+        self.current_voltage = self._ema_voltage
         
         # Calculate percentage
-        old_percentage = self.battery_percentage
         self.battery_percentage = self.voltage_to_percentage(self.current_voltage)
         
-        # Detect charging (voltage increasing)
-        if self.battery_percentage > old_percentage + 2:  # 2% threshold to avoid noise
-            self.is_charging = True
-        elif self.battery_percentage < old_percentage - 1:
-            self.is_charging = False
-        
         # Check for low battery warning
         if self.battery_percentage <= 20 and not self.low_battery_warning:
             self.low_battery_warning = True
@@ -214,31 +284,27 @@ class BatteryMonitor:
             if self.critical_battery_callback:
                 self.critical_battery_callback(self.battery_percentage)
     
-    def _monitoring_loop(self):
-        """Background monitoring loop"""
-        while self.monitoring:
-            try:
-                self._update_battery_readings()
-                time.sleep(self.update_interval)
-                
-            except Exception as e:
-                print(f"Battery monitoring error: {e}")
-                time.sleep(self.update_interval)
-    
-    def start_monitoring(self):
-        """Start battery monitoring in background thread"""
-        if not self.monitoring:
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-            self.monitor_thread.start()
-            print("Battery monitoring started")
-    
-    def stop_monitoring(self):
-        """Stop battery monitoring"""
-        self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=2.0)
-        print("Battery monitoring stopped")
+    def tick(self) -> bool:
+        """
+        Run one monitoring cycle if update_interval has elapsed.
+        Meant to be called from the application's main loop, which
+        replaces a dedicated monitoring thread.
+        
+        Returns:
+            bool: True if readings were updated
+        """
+        now = time.monotonic()
+        if now < self._next_update:
+            return False
+        self._next_update = now + self.update_interval
+        
+        try:
+            self._update_battery_readings()
+            return True
+            
+        except Exception as e:
+            print(f"Battery monitoring error: {e}")
+            return False
     
     def set_low_battery_callback(self, callback: Callable[[int], None]):
         """
@@ -262,53 +328,78 @@ class BatteryMonitor:
         """
         Calibrate voltage range by taking multiple samples
         
+        Stops early once the readings have settled (relative standard
+        deviation below 0.2%).
+        
         Args:
-            samples: Number of samples to take
-            sample_interval: Time between samples
+            samples: Maximum number of samples to take
+            sample_interval: Seconds between samples
         """
         print("Calibrating battery voltage range...")
         print("Make sure battery is at known charge level")
         
-        voltages = []
+        # Welford's online mean/variance, no sample list kept
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        stddev = 0.0
         for i in range(samples):
+            if i:
+                # Back-to-back reads return the same conversion; spread the
+                # samples out so the spread reflects real drift and noise
+                time.sleep(sample_interval)
             voltage = self.read_voltage()
-            voltages.append(voltage)
             print(f"Sample {i+1}: {voltage:.2f}V")
-            time.sleep(sample_interval)
+            
+            n += 1
+            delta = voltage - mean
+            mean += delta / n
+            m2 += delta * (voltage - mean)
+            
+            if n >= 3:
+                stddev = math.sqrt(m2 / (n - 1))
+                if mean > 0 and stddev / mean < 0.002:
+                    print(f"Readings settled after {n} samples")
+                    break
         
-        avg_voltage = sum(voltages) / len(voltages)
-        print(f"Average voltage: {avg_voltage:.2f}V")
+        if n == 0:
+            print("No voltage samples could be read")
+            return 0.0
+        
+        avg_voltage = mean
+        print(f"Average voltage: {avg_voltage:.2f}V (stddev {stddev:.3f}V)")
         
         # You can manually set this as max or min voltage
         print(f"Current range: {self.min_voltage}V - {self.max_voltage}V")
-        print("Update min_voltage and max_voltage based on your battery specifications")
+        print("Update the range with set_voltage_range() based on your battery specifications")
         
         return avg_voltage
     
-    def get_voltage_history(self, duration=60) -> list:
+    def get_voltage_history(self, duration=60) -> np.ndarray:
         """
-        Get voltage readings over a period of time
+        Get voltage readings over a period of time (one sample per second)
         
         Args:
             duration: Duration in seconds
             
         Returns:
-            list: List of voltage readings with timestamps
+            np.ndarray: Array of shape (samples, 2) with columns [timestamp, voltage]
         """
-        history = []
+        # Pre-allocated sample buffer filled by a monotonically advancing index
+        history = np.empty((max(1, int(math.ceil(duration))), 2), dtype=np.float64)
+        count = 0
         start_time = time.time()
         
-        while time.time() - start_time < duration:
-            voltage = self.read_voltage()
-            timestamp = time.time()
-            history.append({'time': timestamp, 'voltage': voltage})
+        while time.time() - start_time < duration and count < len(history):
+            history[count, 1] = self.read_voltage()
+            history[count, 0] = time.time()
+            count += 1
             time.sleep(1.0)
         
-        return history
+        return history[:count]
     
     def cleanup(self):
         """Clean up battery monitor"""
-        self.stop_monitoring()
         print("Battery monitor cleaned up")
 
 # Test function
@@ -332,6 +423,7 @@ def test_battery_monitor():
     start_time = time.time()
     
     while time.time() - start_time < 30:
+        monitor.tick()
         status = monitor.get_battery_status()
         print(f"Battery: {status['percentage']}% ({status['voltage']:.2f}V) - {status['status']}")
         
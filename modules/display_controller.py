@@ -4,11 +4,22 @@ Fixed Enhanced Display Controller with Proper Portrait Mode Support
 Complete version with vertical solar panel interface that works correctly in portrait mode
 """
 
+import os
 import time
 import math
-from datetime import datetime
+import functools
+import threading
+from collections import OrderedDict
 from typing import Dict, Optional
 
+import numpy as np
+
+try:
+    from modules.i2c_bus import open_i2c
+except ImportError:
+    # Run directly as a script (python modules/display_controller.py)
+    from i2c_bus import open_i2c
+
 try:
     import board
     import busio
@@ -19,10 +30,149 @@ except ImportError as e:
     print(f"Display libraries not available: {e}")
     I2C_AVAILABLE = False
 
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_BOLD_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+# Checked once at import so a missing font never costs a failed open per size
+DEJAVU_AVAILABLE = os.path.isfile(FONT_PATH) and os.path.isfile(FONT_BOLD_PATH)
+
+# (size, bold) variants used by the screens, loaded once the panel is up
+PRELOAD_FONTS = ((6, False), (7, False), (9, False), (10, False), (11, False), (12, False),
+                 (8, True), (12, True), (14, True), (16, True), (20, True))
+
+# Number of rendered dynamic text strings kept (battery %, clock, etc.)
+TEXT_CACHE_SIZE = 256
+
+# Number of sun animation sprites kept (one per frame position 0-360)
+SPRITE_CACHE_SIZE = 400
+
+# SSD1306 addressing commands used for partial (windowed) updates
+SET_COL_ADDR = 0x21
+SET_PAGE_ADDR = 0x22
+
+# Period of the blinking CHG label (seconds), half on and half off
+CHG_BLINK_PERIOD = 1.0
+
+# Approximate cost, in data bytes, of opening one more update window (the
+# addressing command transaction plus the data transaction's framing)
+WINDOW_OVERHEAD = 16
+
+
+@functools.lru_cache(maxsize=16)
+def _load_font(path, size):
+    """Load a TrueType font once per (path, size), falling back to the default font"""
+    if path is None:
+        return ImageFont.load_default()
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=1)
+def _measure_draw():
+    """Throwaway 1-bit ImageDraw used only for text measurement"""
+    return ImageDraw.Draw(Image.new("1", (1, 1)))
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _text_width(font, text):
+    """Measure rendered text width once per (font, text) for centering"""
+    bbox = _measure_draw().textbbox((0, 0), text, font=font)
+    return bbox[2] - bbox[0]
+
+
+@functools.lru_cache(maxsize=128)
+def _fmt_pct(level):
+    """Percentage label such as 75%"""
+    return f"{level}%"
+
+
+@functools.lru_cache(maxsize=256)
+def _fmt_watts(power):
+    """Solar power label with one decimal such as 2.5W"""
+    return f"{power:.1f}W"
+
+
+@functools.lru_cache(maxsize=256)
+def _fmt_hours(hours):
+    """Time-to-full label with one decimal such as 1.5H"""
+    return f"{hours:.1f}H"
+
+
+@functools.lru_cache(maxsize=1024)
+def _sun_ray_offsets(size, frame):
+    """Integer (inner, outer) endpoint offsets of the 8 sun rays for one animation frame"""
+    num_rays = 8
+    ray_length = size // 2 + 3
+    inner_radius = size // 2 + 1
+    outer_radius = size // 2 + ray_length
+
+    offsets = []
+    for i in range(num_rays):
+        angle = (i * 45 + frame * 3) * math.pi / 180
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        offsets.append((int(inner_radius * cos_a), int(inner_radius * sin_a),
+                        int(outer_radius * cos_a), int(outer_radius * sin_a)))
+    return tuple(offsets)
+
+
+@functools.lru_cache(maxsize=1024)
+def _particle_positions(frame):
+    """Positions of the energy particles inside the flow zone for one animation frame"""
+    positions = []
+    for i in range(3):
+        # Particles flow vertically downward
+        particle_x = 15 + int(3 * math.sin((frame + i * 20) * 0.1))
+        particle_y = 25 + ((frame + i * 15) % 30)
+
+        # Only show particles in the flow zone
+        if particle_y < 55 and 10 < particle_x < 35:
+            positions.append((particle_x, particle_y))
+    return tuple(positions)
+
+
+@functools.lru_cache(maxsize=1024)
+def _particle_points(frame, max_x, max_y):
+    """Pixels of the 2x2 particle dots for one frame, clamped so each dot fits the image"""
+    points = []
+    for particle_x, particle_y in _particle_positions(frame):
+        particle_x = max(0, min(particle_x, max_x))
+        particle_y = max(0, min(particle_y, max_y))
+        points += [(particle_x, particle_y), (particle_x + 1, particle_y),
+                   (particle_x, particle_y + 1), (particle_x + 1, particle_y + 1)]
+    return tuple(points)
+
+
+# (second, local time, strftime results per format) for the current second,
+# replaced as one tuple so concurrent callers never see a mixed state
+_clock_state = (None, None, {})
+
+
+def _format_clock(fmt):
+    """Format the current local time, re-running strftime only when the second changes"""
+    global _clock_state
+    now = int(time.time())
+    second, local, texts = _clock_state
+    if now != second:
+        # One localtime() per second, shared by every format
+        local = time.localtime(now)
+        texts = {}
+        _clock_state = (now, local, texts)
+    text = texts.get(fmt)
+    if text is None:
+        text = time.strftime(fmt, local)
+        texts[fmt] = text
+    return text
+
 
 class EnhancedDisplayController:
-    def __init__(self, width=128, height=64, address=0x3C, auto_detect=True, rotation=0):
+    def __init__(self, width=128, height=64, address=0x3C, auto_detect=True, rotation=0, i2c=None):
         """Initialize enhanced display controller with vertical solar capabilities"""
+        # Shared I2C bus (created on first use if not injected)
+        self.i2c = i2c
+
         # Physical display dimensions (never change these)
         self.physical_width = width
         self.physical_height = height
@@ -34,6 +184,32 @@ class EnhancedDisplayController:
         self.animation_frame = 0
         self.display_mode = 'solar'  # Default to solar mode
 
+        # Pre-rendered static chrome and reusable per-screen frames, built on first use
+        self._static_layers = {}
+        self._frames = {}
+        self._bar_fills = {}
+        self._sun_sprites = OrderedDict()
+        self._status_base = None
+        self._solar_base = None
+        self._solar_base_key = None
+        self._text_tiles = OrderedDict()
+
+        # Copy of the last framebuffer pushed to the panel, for dirty-page updates
+        self._shadow_frame = None
+
+        # Latest state waiting to be drawn by flush(), held back while a
+        # timed message is on screen. The render thread waits on _render_cv
+        # for it; _render_lock serializes drawing between threads.
+        self._pending_state = None
+        self._message_until = 0.0
+        self._render_cv = threading.Condition()
+        self._render_lock = threading.RLock()
+        self._render_thread = None
+        self._render_stopped = False
+
+        # Inputs of the screen currently on the panel, for skipping identical redraws
+        self._last_render_key = None
+
         # Set logical dimensions based on rotation
         self.rotation = rotation
         if rotation in [90, 270]:
@@ -45,17 +221,152 @@ class EnhancedDisplayController:
             self.logical_width = width  # 128 pixels wide
             self.logical_height = height  # 64 pixels tall
 
+        # Fixed geometry for the current orientation
+        self._layout = self._build_layout()
+
+        # Screen drawn by update_status() for each display mode
+        self._mode_dispatch = {
+            'solar': self._dispatch_solar,
+            'battery': self._dispatch_battery,
+            'normal': self._show_normal_status,
+        }
+
         if not I2C_AVAILABLE:
             print("✗ Display controller: Required libraries not installed")
             return
 
-        if self._initialize_display(address, width, height):
-            return
-
-        if auto_detect:
+        if not self._initialize_display(address, width, height) and auto_detect:
             print(f"Display not found at 0x{address:02X}, trying auto-detection...")
             self._auto_detect_display()
 
+        # Draw marked states off the caller's thread
+        if self.available:
+            self._render_thread = threading.Thread(target=self._render_loop, daemon=True)
+            self._render_thread.start()
+
+    def _build_layout(self):
+        """Compute layout geometry that depends only on the logical display size"""
+        if self.rotation in [90, 270]:
+            return {
+                'battery_bar': (10, 70, self.logical_width - 20, 30),
+                'status_bar': (10, 80, self.logical_width - 20, 20),
+                # x, y, bar width, total height, number of bars (much taller for portrait)
+                'solar_bars': (25, 35, 12, 80, 16),
+            }
+        return {
+            'battery_bar': (10, 42, self.logical_width - 20, 12),
+            'status_bar': (70, 36, 52, 6),
+            'solar_bars': (45, 15, 8, 35, 12),
+        }
+
+    def _get_font(self, size, bold=False):
+        """Return the DejaVu font at the given size from the module-wide cache"""
+        if not DEJAVU_AVAILABLE:
+            return _load_font(None, 0)
+        return _load_font(FONT_BOLD_PATH if bold else FONT_PATH, size)
+
+    def _get_text_tile(self, font, text):
+        """Return a cached 1-bit tile of text rendered at the origin"""
+        key = (font, text)
+        tile = self._text_tiles.get(key)
+        if tile is None:
+            # Margin covers glyph overhang past the reported bbox
+            right, bottom = font.getbbox(text)[2:]
+            tile = Image.new("1", (max(1, right + 2), max(1, bottom + 2)))
+            ImageDraw.Draw(tile).text((0, 0), text, font=font, fill=255)
+            self._text_tiles[key] = tile
+            if len(self._text_tiles) > TEXT_CACHE_SIZE:
+                self._text_tiles.popitem(last=False)
+        else:
+            self._text_tiles.move_to_end(key)
+        return tile
+
+    def _draw_text(self, image, xy, text, font):
+        """Draw dynamic text by pasting a cached pre-rendered tile"""
+        image.paste(255, xy, self._get_text_tile(font, text))
+
+    def _get_static_layer(self, name):
+        """Return the pre-rendered static chrome for a screen, building it once"""
+        layer = self._static_layers.get(name)
+        if layer is None:
+            layer = Image.new("1", (self.logical_width, self.logical_height))
+            draw = ImageDraw.Draw(layer)
+            portrait = self.rotation in [90, 270]
+
+            if name == 'solar':
+                small_font = self._get_font(7)
+                tiny_font = self._get_font(6)
+                if portrait:
+                    draw.text((2, 0), "SOLAR", font=small_font, fill=255)
+                    draw.text((2, 10), "PANEL", font=tiny_font, fill=255)
+                else:
+                    draw.text((2, 0), "SOLAR PANEL", font=small_font, fill=255)
+                draw.text((2, self.logical_height - 8), "WALL-E", font=tiny_font, fill=255)
+
+                # Charge bar outlines; frames only draw the fills
+                bars_x, bars_y, bar_width, bars_height, num_bars = self._layout['solar_bars']
+                self.draw_vertical_charge_bars(draw, bars_x, bars_y, bar_width, bars_height, 0, num_bars)
+
+            elif name == 'battery':
+                font = self._get_font(12)
+                if portrait:
+                    draw.text((5, 5), "WALL-E", font=font, fill=255)
+                    draw.text((5, 20), "BATTERY", font=font, fill=255)
+                else:
+                    draw.text((5, 0), "WALL-E BATTERY", font=font, fill=255)
+                bar_x, bar_y, bar_width, bar_height = self._layout['battery_bar']
+                self.safe_rectangle(draw, (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
+                                    outline=255, fill=0)
+
+            elif name == 'status':
+                font = self._get_font(11)
+                small_font = self._get_font(9)
+                draw.text((0, 0), "WALL-E Status", font=font, fill=255)
+                draw.line([(0, 12), (self.logical_width, 12)], fill=255)
+                if portrait:
+                    draw.text((0, 14), "Mode:", font=small_font, fill=255)
+                    draw.text((0, 34), "Status:", font=small_font, fill=255)
+                    draw.text((0, 54), "Battery:", font=small_font, fill=255)
+                bar_x, bar_y, bar_width, bar_height = self._layout['status_bar']
+                self.safe_rectangle(draw, (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
+                                    outline=255, fill=0)
+
+            # Any other screen (e.g. 'message') starts from a blank layer
+            self._static_layers[name] = layer
+        return layer
+
+    def _begin_frame(self, name):
+        """
+        Return the reusable (image, draw) pair for a screen, reset to its static chrome.
+        The frame is allocated once and overwritten in place on every redraw.
+        """
+        frame = self._frames.get(name)
+        if frame is None:
+            image = Image.new("1", (self.logical_width, self.logical_height))
+            frame = (image, ImageDraw.Draw(image))
+            self._frames[name] = frame
+        frame[0].paste(self._get_static_layer(name))
+        return frame
+
+    def _to_physical(self, image):
+        """
+        Counter-rotate a logical (portrait) frame onto the physical display.
+        The transpose already has the physical size, so it is used directly;
+        only a mismatched panel size needs a physical-size canvas.
+        """
+        if self.rotation == 90:
+            rotated = image.transpose(Image.ROTATE_270)
+        elif self.rotation == 270:
+            rotated = image.transpose(Image.ROTATE_90)
+        else:
+            return image
+
+        if rotated.size != (self.physical_width, self.physical_height):
+            physical_image = Image.new("1", (self.physical_width, self.physical_height))
+            physical_image.paste(rotated, (0, 0))
+            return physical_image
+        return rotated
+
     def rotate_image_for_display(self, image):
         """
         Rotate image for the physical display.
@@ -74,6 +385,14 @@ class EnhancedDisplayController:
         addresses_to_try = [0x3C, 0x3D, 0x78, 0x7A, 0x3E, 0x3F]
         sizes_to_try = [(128, 64), (128, 32), (64, 48)]
 
+        # One bus scan instead of a full init + frame write per candidate address
+        found = self._scan_i2c()
+        if found is not None:
+            addresses_to_try = [addr for addr in addresses_to_try if addr in found]
+            if not addresses_to_try:
+                print("✗ No OLED display detected during auto-detection")
+                return
+
         for addr in addresses_to_try:
             for width, height in sizes_to_try:
                 if self._initialize_display(addr, width, height):
@@ -82,13 +401,35 @@ class EnhancedDisplayController:
 
         print("✗ No OLED display detected during auto-detection")
 
+    def _scan_i2c(self):
+        """
+        Scan the I2C bus once
+
+        Returns:
+            set: Responding addresses, or None if the bus could not be scanned
+        """
+        try:
+            if self.i2c is None:
+                self.i2c = open_i2c()
+            while not self.i2c.try_lock():
+                pass
+            try:
+                return set(self.i2c.scan())
+            finally:
+                self.i2c.unlock()
+        except Exception as e:
+            print(f"I2C scan failed, probing addresses directly: {e}")
+            return None
+
     def _initialize_display(self, address, width, height):
         """Try to initialize display with specific parameters"""
         try:
-            i2c = busio.I2C(board.SCL, board.SDA)
-            self.display = adafruit_ssd1306.SSD1306_I2C(width, height, i2c, addr=address)
-            self.display.fill(0)
-            self.display.show()
+            if self.i2c is None:
+                self.i2c = open_i2c()
+            # The driver's init sequence already blanks the panel; the first
+            # frame after this is always sent in full (no shadow yet)
+            self.display = adafruit_ssd1306.SSD1306_I2C(width, height, self.i2c, addr=address)
+            self._shadow_frame = None
 
             self.address = address
             self.physical_width = width
@@ -98,6 +439,11 @@ class EnhancedDisplayController:
             print(f"✓ OLED display initialized at 0x{address:02X} ({width}x{height})")
             print(f"  Rotation: {self.rotation}°")
             print(f"  Logical size: {self.logical_width}x{self.logical_height}")
+
+            # Parse every font now rather than on the first frame of each screen
+            for size, bold in PRELOAD_FONTS:
+                self._get_font(size, bold)
+
             self.show_startup_message()
             return True
 
@@ -114,15 +460,12 @@ class EnhancedDisplayController:
             image = Image.new("1", (self.physical_width, self.physical_height))
             draw = ImageDraw.Draw(image)
 
-            try:
-                if self.physical_height >= 64:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-                    small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-                else:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 12)
-                    small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 10)
-            except:
-                font = small_font = ImageFont.load_default()
+            if self.physical_height >= 64:
+                font = self._get_font(16, bold=True)
+                small_font = self._get_font(12)
+            else:
+                font = self._get_font(12, bold=True)
+                small_font = self._get_font(10)
 
             # Draw startup message for the physical display layout
             if self.rotation in [90, 270]:
@@ -136,19 +479,120 @@ class EnhancedDisplayController:
                     draw.text((10, 5), "WALL-E", font=font, fill=255)
                     draw.text((10, 25), "Control System", font=small_font, fill=255)
                     draw.text((10, 40), "Vertical Solar", font=small_font, fill=255)
-                    draw.text((10, 52), datetime.now().strftime("%H:%M"), font=small_font, fill=255)
+                    draw.text((10, 52), _format_clock("%H:%M"), font=small_font, fill=255)
                 else:
                     draw.text((5, 2), "WALL-E", font=font, fill=255)
                     draw.text((5, 18), "Vertical Solar", font=small_font, fill=255)
 
             # Rotate if needed and display
             rotated_image = self.rotate_image_for_display(image)
-            self.display.image(rotated_image)
-            self.display.show()
+            self._show_image(rotated_image)
 
         except Exception as e:
             print(f"Error showing startup message: {e}")
 
+    def _pack_image(self, image):
+        """
+        Pack a physical-size 1-bit image into SSD1306 page-major bytes.
+        Each byte is one column of an 8-row page, LSB at the top, so the
+        (height, width) pixel array is regrouped as (pages, 8, width) and
+        bit-packed along the row axis in one NumPy call, instead of the
+        driver's per-pixel image() loop.
+        """
+        if image.size != (self.physical_width, self.physical_height):
+            raise ValueError(f"Image size {image.size} does not match display")
+        if image.mode != "1":
+            image = image.convert("1")
+        pixels = np.asarray(image, dtype=bool)
+        pages = pixels.reshape(self.physical_height // 8, 8, self.physical_width)
+        return np.packbits(pages, axis=1, bitorder='little').tobytes()
+
+    def _show_image(self, image):
+        """
+        Push a physical-size image to the panel.
+        Only the columns that changed on each 8-pixel page are sent; the
+        first frame (or any frame after a size change) is sent in full.
+        """
+        self._show_frame(self._pack_image(image))
+
+    def _show_frame(self, frame):
+        """Push packed page-major frame bytes, sending only the dirty page spans"""
+        # The panel no longer shows whatever the last render key described
+        self._last_render_key = None
+
+        display = self.display
+        previous = self._shadow_frame
+        if frame == previous:
+            # Identical frame: nothing to copy or send
+            return
+
+        # I2C framebuffer starts with the 0x40 data control byte
+        display.buffer[1:] = frame
+
+        if previous is None or len(previous) != len(frame):
+            display.show()
+            self._shadow_frame = frame
+            return
+
+        width = self.physical_width
+        col_offset = (128 - width) // 2
+
+        # Collect the dirty column span of each changed page, then merge runs of
+        # pages into one window whenever the extra clean bytes cost less than
+        # another addressing + data transaction pair
+        windows = []
+        for page in range(len(frame) // width):
+            start = page * width
+            old = previous[start:start + width]
+            new = frame[start:start + width]
+            if old == new:
+                continue
+
+            x0 = 0
+            while old[x0] == new[x0]:
+                x0 += 1
+            x1 = width - 1
+            while old[x1] == new[x1]:
+                x1 -= 1
+
+            if windows:
+                p0, p1, c0, c1 = windows[-1]
+                m0, m1 = min(c0, x0), max(c1, x1)
+                merged = (page - p0 + 1) * (m1 - m0 + 1)
+                separate = (p1 - p0 + 1) * (c1 - c0 + 1) + (x1 - x0 + 1) + WINDOW_OVERHEAD
+                if merged <= separate:
+                    windows[-1] = (p0, page, m0, m1)
+                    continue
+            windows.append((page, page, x0, x1))
+
+        try:
+            with display.i2c_device:
+                for p0, p1, c0, c1 in windows:
+                    # One command transaction (0x00 control byte, Co=0 command stream)
+                    # and one data transaction per window; the panel's horizontal
+                    # addressing mode wraps each page's span into the next page
+                    display.i2c_device.write(bytes((0x00,
+                                                    SET_COL_ADDR, col_offset + c0, col_offset + c1,
+                                                    SET_PAGE_ADDR, p0, p1)))
+                    if p0 == p1:
+                        data = frame[p0 * width + c0:p0 * width + c1 + 1]
+                    else:
+                        data = b"".join(frame[page * width + c0:page * width + c1 + 1]
+                                        for page in range(p0, p1 + 1))
+                    display.i2c_device.write(b"\x40" + data)
+        except Exception:
+            # The panel may hold part of this frame; diff against nothing so
+            # the next frame is sent in full
+            self._shadow_frame = None
+            raise
+
+        self._shadow_frame = frame
+
+    def _fill_rect(self, image, coords):
+        """Fill an inclusive, in-bounds rectangle with a single C-level paste"""
+        x1, y1, x2, y2 = coords
+        image.paste(255, (x1, y1, x2 + 1, y2 + 1))
+
     def safe_rectangle(self, draw, coords, **kwargs):
         """Draw rectangle with safe coordinates using LOGICAL dimensions"""
         x1, y1, x2, y2 = coords
@@ -195,27 +639,43 @@ class EnhancedDisplayController:
                                 outline=255, fill=0)
 
             # Rotating sun rays
-            num_rays = 8
-            ray_length = size // 2 + 3
-
-            for i in range(num_rays):
-                angle = (i * 45 + frame * 3) * math.pi / 180
-
-                inner_radius = size // 2 + 1
-                outer_radius = size // 2 + ray_length
-
-                inner_x = x + int(inner_radius * math.cos(angle))
-                inner_y = y + int(inner_radius * math.sin(angle))
-                outer_x = x + int(outer_radius * math.cos(angle))
-                outer_y = y + int(outer_radius * math.sin(angle))
-
-                self.safe_line(draw, (inner_x, inner_y, outer_x, outer_y), fill=255, width=1)
+            for inner_dx, inner_dy, outer_dx, outer_dy in _sun_ray_offsets(size, frame):
+                self.safe_line(draw, (x + inner_dx, y + inner_dy, x + outer_dx, y + outer_dy),
+                               fill=255, width=1)
 
         except Exception as e:
             print(f"Error drawing sun: {e}")
 
-    def draw_vertical_charge_bars(self, draw, x, y, width, height, battery_level, num_bars=12):
-        """Draw VERTICAL charge bars - stack vertically, fill from bottom up"""
+    def _paste_sun(self, image, x, y, size, frame):
+        """
+        Stamp the sun for an animation frame in one paste.
+        Each (position, size, frame) is drawn once with draw_sun() into a
+        cropped 1-bit sprite kept in a small LRU cache.
+        """
+        key = (x, y, size, frame)
+        sprite = self._sun_sprites.get(key)
+        if sprite is None:
+            mask = Image.new("1", (self.logical_width, self.logical_height))
+            self.draw_sun(ImageDraw.Draw(mask), x, y, size=size, frame=frame)
+            bbox = mask.getbbox()
+            sprite = (bbox, mask.crop(bbox) if bbox else None)
+            self._sun_sprites[key] = sprite
+            if len(self._sun_sprites) > SPRITE_CACHE_SIZE:
+                self._sun_sprites.popitem(last=False)
+        else:
+            self._sun_sprites.move_to_end(key)
+        bbox, mask = sprite
+        if mask is not None:
+            image.paste(255, bbox, mask)
+
+    def draw_vertical_charge_bars(self, draw, x, y, width, height, battery_level, num_bars=12,
+                                  outline=True):
+        """
+        Draw VERTICAL charge bars - stack vertically, fill from bottom up
+
+        Pass outline=False to draw only the fills on top of outlines that
+        are already in the image (e.g. from the cached static layer).
+        """
         try:
             bar_spacing = 2
             available_height = height - (bar_spacing * (num_bars - 1))
@@ -223,18 +683,21 @@ class EnhancedDisplayController:
 
             # Calculate how many bars should be filled
             bars_to_fill = int((battery_level / 100.0) * num_bars)
+            segment_size = 100.0 / num_bars
+            last_bar_y = self.logical_height - 10
 
             for i in range(num_bars):
                 bar_y = y + i * (bar_height + bar_spacing)
 
                 # Skip if bar would be outside logical display
-                if bar_y + bar_height >= self.logical_height - 10:
+                if bar_y + bar_height >= last_bar_y:
                     continue
 
                 # Draw bar outline (all bars always have outlines)
-                self.safe_rectangle(draw,
-                                    (x, bar_y, x + width, bar_y + bar_height),
-                                    outline=255, fill=0)
+                if outline:
+                    self.safe_rectangle(draw,
+                                        (x, bar_y, x + width, bar_y + bar_height),
+                                        outline=255, fill=0)
 
                 # Fill bars from bottom up (like fuel gauge filling from bottom)
                 # Bottom bar (highest index) fills first
@@ -246,7 +709,7 @@ class EnhancedDisplayController:
                                         fill=255)
                 elif bar_from_bottom == bars_to_fill:
                     # Partial bar (currently filling)
-                    fill_percentage = (battery_level % (100.0 / num_bars)) / (100.0 / num_bars)
+                    fill_percentage = (battery_level % segment_size) / segment_size
                     if fill_percentage > 0:
                         fill_width = max(1, int((width - 2) * fill_percentage))
                         self.safe_rectangle(draw,
@@ -256,29 +719,38 @@ class EnhancedDisplayController:
         except Exception as e:
             print(f"Error drawing vertical charge bars: {e}")
 
+    def _paste_charge_bar_fills(self, image, battery_level):
+        """
+        Stamp the solar charge-bar fills for a battery level in one paste.
+        The fill pattern is rendered once per level into a cropped 1-bit mask.
+        """
+        fill = self._bar_fills.get(battery_level)
+        if fill is None:
+            mask = Image.new("1", (self.logical_width, self.logical_height))
+            bars_x, bars_y, bar_width, bars_height, num_bars = self._layout['solar_bars']
+            self.draw_vertical_charge_bars(ImageDraw.Draw(mask), bars_x, bars_y, bar_width, bars_height,
+                                           battery_level, num_bars, outline=False)
+            bbox = mask.getbbox()
+            fill = (bbox, mask.crop(bbox) if bbox else None)
+            self._bar_fills[battery_level] = fill
+        bbox, mask = fill
+        if mask is not None:
+            image.paste(255, bbox, mask)
+
     def draw_vertical_energy_particles(self, draw, frame):
         """Draw energy particles flowing vertically downward from sun to charge bars"""
         try:
-            for i in range(3):
-                # Particles flow vertically downward
-                particle_x = 15 + int(3 * math.sin((frame + i * 20) * 0.1))
-                particle_y = 25 + ((frame + i * 15) % 30)
-
-                # Only show particles in the flow zone
-                if particle_y < 55 and 10 < particle_x < 35:
-                    # Clamp particle position to logical bounds
-                    particle_x = max(0, min(particle_x, self.logical_width - 2))
-                    particle_y = max(0, min(particle_y, self.logical_height - 2))
-
-                    self.safe_rectangle(draw,
-                                        (particle_x, particle_y, particle_x + 1, particle_y + 1),
-                                        fill=255)
+            # All particle pixels for the frame in one PIL call
+            points = _particle_points(frame, self.logical_width - 2, self.logical_height - 2)
+            if points:
+                draw.point(points, fill=255)
 
         except Exception as e:
             print(f"Error drawing vertical energy particles: {e}")
 
     def show_solar_panel_mode(self, battery_level: int = 85, solar_power: float = 1.2,
-                              is_charging: bool = True, time_to_full: float = 2.5):
+                              is_charging: bool = True, time_to_full: float = 2.5,
+                              update_display: bool = True):
         """
         Show solar panel charging interface optimized for portrait mode
 
@@ -287,461 +759,507 @@ class EnhancedDisplayController:
             solar_power: Solar power in watts
             is_charging: Whether currently charging
             time_to_full: Hours to full charge
+            update_display: Push the frame to the panel; False only renders it,
+                for timing the drawing code without I2C
         """
         if not self.available:
             return
 
-        try:
-            # Create image in LOGICAL dimensions first
-            image = Image.new("1", (self.logical_width, self.logical_height))
-            draw = ImageDraw.Draw(image)
-
+        with self._render_lock:
             try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 8)
-                small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 7)
-                tiny_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 6)
-            except:
-                font = small_font = tiny_font = ImageFont.load_default()
-
-            if self.rotation in [90, 270]:
-                # === PORTRAIT LAYOUT (64x128 logical) ===
+                font = self._get_font(8, bold=True)
+                small_font = self._get_font(7)
+                tiny_font = self._get_font(6)
+                portrait = self.rotation in [90, 270]
+
+                watts = round(solar_power, 1)
+                hours = round(time_to_full, 1) if is_charging else None
+                current_time = _format_clock("%H:%M")
+                base_key = (battery_level, watts, is_charging, hours, current_time)
+
+                if base_key == self._solar_base_key:
+                    # Only the animation moved: restore the cached bars and labels
+                    image, draw = self._frames['solar']
+                    image.paste(self._solar_base)
+                else:
+                    # Start from the static chrome (title, footer, bar outlines) in LOGICAL dimensions
+                    image, draw = self._begin_frame('solar')
 
-                # Title at top
-                draw.text((2, 0), "SOLAR", font=small_font, fill=255)
-                draw.text((2, 10), "PANEL", font=tiny_font, fill=255)
+                    # VERTICAL charge bar fills
+                    self._paste_charge_bar_fills(image, battery_level)
 
-                # Sun icon (top left, smaller for portrait)
-                sun_x, sun_y = 15, 25
-                self.draw_sun(draw, sun_x, sun_y, size=8, frame=self.animation_frame)
+                    if portrait:
+                        # === PORTRAIT LAYOUT (64x128 logical) ===
 
-                # Energy flow particles (vertical flow downward)
-                if is_charging:
-                    self.draw_vertical_energy_particles(draw, self.animation_frame)
+                        # Right side status (stacked vertically)
+                        status_x = 42
 
-                # VERTICAL charge bars (center of display)
-                bars_start_x = 25
-                bars_start_y = 35
-                bar_width = 12
-                bars_height = 80  # Much taller for portrait mode
+                        # Battery percentage
+                        self._draw_text(image, (status_x, 40), _fmt_pct(battery_level), font)
 
-                self.draw_vertical_charge_bars(draw, bars_start_x, bars_start_y, bar_width, bars_height, battery_level, 16)
+                        # Solar power
+                        self._draw_text(image, (status_x, 55), _fmt_watts(watts), small_font)
 
-                # Right side status (stacked vertically)
-                status_x = 42
+                        # Charging status
+                        if is_charging:
+                            self._draw_text(image, (status_x, 85), _fmt_hours(hours), tiny_font)
+                        else:
+                            self._draw_text(image, (status_x, 70), "IDLE", small_font)
 
-                # Battery percentage
-                draw.text((status_x, 40), f"{battery_level}%", font=font, fill=255)
+                        # Bottom status
+                        self._draw_text(image, (35, self.logical_height - 8), current_time, tiny_font)
 
-                # Solar power
-                draw.text((status_x, 55), f"{solar_power:.1f}W", font=small_font, fill=255)
-
-                # Charging status
-                if is_charging:
-                    if self.animation_frame % 20 < 10:  # Blinking
-                        draw.text((status_x, 70), "CHG", font=small_font, fill=255)
-                    draw.text((status_x, 85), f"{time_to_full:.1f}H", font=tiny_font, fill=255)
-                else:
-                    draw.text((status_x, 70), "IDLE", font=small_font, fill=255)
+                    else:
+                        # === LANDSCAPE LAYOUT (128x64 logical) ===
 
-                # Bottom status
-                draw.text((2, self.logical_height - 8), "WALL-E", font=tiny_font, fill=255)
-                draw.text((35, self.logical_height - 8), datetime.now().strftime("%H:%M"), font=tiny_font, fill=255)
+                        # Right side status
+                        status_x = 65
+                        self._draw_text(image, (status_x, 12), _fmt_pct(battery_level), font)
+                        self._draw_text(image, (status_x, 24), _fmt_watts(watts), small_font)
 
-            else:
-                # === LANDSCAPE LAYOUT (128x64 logical) ===
+                        if is_charging:
+                            self._draw_text(image, (status_x, 46), _fmt_hours(hours), tiny_font)
+                        else:
+                            self._draw_text(image, (status_x, 36), "IDLE", small_font)
 
-                # Title at top left
-                draw.text((2, 0), "SOLAR PANEL", font=small_font, fill=255)
+                        # Bottom status
+                        self._draw_text(image, (85, self.logical_height - 8), current_time, tiny_font)
 
-                # Sun icon (top left)
-                sun_x, sun_y = 20, 25
-                self.draw_sun(draw, sun_x, sun_y, size=12, frame=self.animation_frame)
+                    # Keep everything but the animation for frames where only it moves
+                    if self._solar_base is None:
+                        self._solar_base = image.copy()
+                    else:
+                        self._solar_base.paste(image)
+                    self._solar_base_key = base_key
+
+                # Animated overlay; every layer only sets pixels, so drawing it
+                # after the labels gives the same frame as drawing it first
+                if portrait:
+                    # Sun icon (top left, smaller for portrait)
+                    self._paste_sun(image, 15, 25, 8, self.animation_frame)
+                    chg_xy = (42, 70)
+                else:
+                    # Sun icon (top left)
+                    self._paste_sun(image, 20, 25, 12, self.animation_frame)
+                    chg_xy = (65, 36)
 
-                # Energy flow particles
                 if is_charging:
+                    # Energy flow particles (vertical flow downward)
                     self.draw_vertical_energy_particles(draw, self.animation_frame)
 
-                # Vertical charge bars for landscape
-                bars_start_x = 45
-                bars_start_y = 15
-                bar_width = 8
-                bars_height = 35
-
-                self.draw_vertical_charge_bars(draw, bars_start_x, bars_start_y, bar_width, bars_height, battery_level, 12)
-
-                # Right side status
-                status_x = 65
-                draw.text((status_x, 12), f"{battery_level}%", font=font, fill=255)
-                draw.text((status_x, 24), f"{solar_power:.1f}W", font=small_font, fill=255)
-
-                if is_charging:
-                    if self.animation_frame % 20 < 10:
-                        draw.text((status_x, 36), "CHG", font=small_font, fill=255)
-                    draw.text((status_x, 46), f"{time_to_full:.1f}H", font=tiny_font, fill=255)
-                else:
-                    draw.text((status_x, 36), "IDLE", font=small_font, fill=255)
-
-                # Bottom status
-                draw.text((2, self.logical_height - 8), "WALL-E", font=tiny_font, fill=255)
-                draw.text((85, self.logical_height - 8), datetime.now().strftime("%H:%M"), font=tiny_font, fill=255)
-
-            # Convert logical image to physical display
-            if self.rotation in [90, 270]:
-                # For portrait mode, we need to create a physical-sized image and rotate the logical one
-                physical_image = Image.new("1", (self.physical_width, self.physical_height))
-
-                # The logical image (64x128) needs to be placed/rotated to fit physical (128x64)
-                if self.rotation == 90:
-                    rotated_logical = image.transpose(Image.ROTATE_270)  # Counter-rotate for display
-                else:  # rotation == 270
-                    rotated_logical = image.transpose(Image.ROTATE_90)  # Counter-rotate for display
-
-                physical_image.paste(rotated_logical, (0, 0))
-                final_image = physical_image
-            else:
-                final_image = image
+                    # Blinking charging status, phased on wall time so it stays
+                    # regular however often frames are drawn
+                    if time.monotonic() % CHG_BLINK_PERIOD < CHG_BLINK_PERIOD / 2:
+                        self._draw_text(image, chg_xy, "CHG", small_font)
 
-            self.display.image(final_image)
-            self.display.show()
+                # Convert logical image to physical display
+                if update_display:
+                    self._show_image(self._to_physical(image))
 
-            # Increment animation frame
-            self.animation_frame += 1
-            if self.animation_frame > 360:
-                self.animation_frame = 0
+                # Increment animation frame
+                self.animation_frame += 1
+                if self.animation_frame > 360:
+                    self.animation_frame = 0
 
-        except Exception as e:
-            print(f"Error showing solar panel mode: {e}")
+            except Exception as e:
+                print(f"Error showing solar panel mode: {e}")
 
     def update_status(self, walle_state: Dict):
         """Enhanced status update with solar mode as default"""
         if not self.available:
             return
 
-        try:
-            battery_level = walle_state.get('battery_level', 100)
-            is_charging = walle_state.get('is_charging', False)
-            solar_power = walle_state.get('solar_power', 0.0)
+        with self._render_lock:
+            try:
+                battery_level = walle_state.get('battery_level', 100)
 
-            # Solar mode is default
-            self.display_mode = 'solar'
+                # Solar mode is default; only switch to other modes in special cases
+                self.display_mode = 'battery' if battery_level < 15 else 'solar'
 
-            # Only switch to other modes in special cases
-            if battery_level < 15:
-                self.display_mode = 'battery'
+                self._mode_dispatch[self.display_mode](walle_state)
 
-            if self.display_mode == 'solar':
-                time_to_full = walle_state.get('time_to_full', 0.0)
-                self.show_solar_panel_mode(battery_level, solar_power, is_charging, time_to_full)
-            elif self.display_mode == 'battery':
-                self.show_battery_focus(battery_level, walle_state.get('battery_voltage', 0.0), is_charging)
-            else:
-                self._show_normal_status(walle_state)
+                self.last_battery_level = battery_level
+
+            except Exception as e:
+                print(f"Error updating status: {e}")
+
+    def _dispatch_solar(self, walle_state: Dict):
+        """Show the solar screen for a status update"""
+        battery_level = walle_state.get('battery_level', 100)
+        solar_power = walle_state.get('solar_power', 0.0)
+        is_charging = walle_state.get('is_charging', False)
+        time_to_full = walle_state.get('time_to_full', 0.0)
+
+        # While idle with no visible value changed, keep the screen as it is;
+        # while charging, every update moves the animation along
+        blink_on = None
+        if is_charging:
+            blink_on = time.monotonic() % CHG_BLINK_PERIOD < CHG_BLINK_PERIOD / 2
+        render_key = ('solar', battery_level, round(solar_power, 1), is_charging,
+                      round(time_to_full, 1) if is_charging else None, blink_on,
+                      _format_clock("%H:%M"))
+        if render_key == self._last_render_key and not is_charging:
+            return
 
-            self.last_battery_level = battery_level
+        self.show_solar_panel_mode(battery_level, solar_power, is_charging, time_to_full)
+        self._last_render_key = render_key
 
-        except Exception as e:
-            print(f"Error updating status: {e}")
+    def _dispatch_battery(self, walle_state: Dict):
+        """Show the battery screen for a status update"""
+        self.show_battery_focus(walle_state.get('battery_level', 100),
+                                walle_state.get('battery_voltage', 0.0),
+                                walle_state.get('is_charging', False))
+
+    def mark_dirty(self, walle_state: Dict):
+        """
+        Record the latest state to show and wake the render thread.
+        Returns immediately; a state not yet drawn is replaced (latest wins).
+        """
+        with self._render_cv:
+            if self._render_stopped:
+                return
+            self._pending_state = walle_state
+            self._render_cv.notify()
+
+    def flush(self):
+        """Draw the most recently marked state once, coalescing earlier updates"""
+        with self._render_cv:
+            walle_state = self._pending_state
+            if walle_state is None or time.monotonic() < self._message_until:
+                return
+            self._pending_state = None
+        self.update_status(walle_state)
+
+    def _render_loop(self):
+        """Background thread drawing marked states as they arrive"""
+        while True:
+            with self._render_cv:
+                # Sleep until there is a state to draw and no timed message is up
+                while not self._render_stopped and (
+                        self._pending_state is None or time.monotonic() < self._message_until):
+                    timeout = None
+                    if self._pending_state is not None:
+                        timeout = self._message_until - time.monotonic()
+                    self._render_cv.wait(timeout)
+                if self._render_stopped:
+                    return
+            self.flush()
 
     def show_battery_focus(self, battery_level: int, voltage: float = 0.0, charging: bool = False):
         """Show focused battery display"""
         if not self.available:
             return
 
-        try:
-            # Create image in logical dimensions
-            image = Image.new("1", (self.logical_width, self.logical_height))
-            draw = ImageDraw.Draw(image)
-
+        with self._render_lock:
             try:
-                big_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-                small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 10)
-            except:
-                big_font = font = small_font = ImageFont.load_default()
-
-            # Adapt layout for orientation
-            if self.rotation in [90, 270]:
-                # Portrait battery layout
-                draw.text((5, 5), "WALL-E", font=font, fill=255)
-                draw.text((5, 20), "BATTERY", font=font, fill=255)
-
-                # Large percentage (centered)
-                percentage_text = f"{battery_level}%"
-                bbox = draw.textbbox((0, 0), percentage_text, font=big_font)
-                text_width = bbox[2] - bbox[0]
-                x = (self.logical_width - text_width) // 2
-                draw.text((x, 40), percentage_text, font=big_font, fill=255)
+                # Nothing visible changed since the last frame
+                render_key = ('battery', battery_level, f"{voltage:.1f}" if voltage > 0 else None, charging)
+                if render_key == self._last_render_key:
+                    return
 
-                # Vertical battery bar
-                bar_x, bar_y = 10, 70
-                bar_width, bar_height = self.logical_width - 20, 30
+                # Start from the static chrome (titles, bar outline) in logical dimensions
+                image, draw = self._begin_frame('battery')
 
-                # Battery outline
-                self.safe_rectangle(draw, (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
-                                    outline=255, fill=0)
+                big_font = self._get_font(20, bold=True)
+                small_font = self._get_font(10)
 
-                # Battery fill
-                fill_height = int((battery_level / 100.0) * (bar_height - 2))
-                if fill_height > 0:
-                    self.safe_rectangle(draw,
-                                        (bar_x + 1, bar_y + bar_height - 1 - fill_height,
-                                         bar_x + bar_width - 1, bar_y + bar_height - 1),
-                                        fill=255)
+                # Adapt layout for orientation
+                if self.rotation in [90, 270]:
+                    # Portrait battery layout
 
-                # Status
-                if voltage > 0:
-                    draw.text((5, self.logical_height - 20), f"{voltage:.1f}V", font=small_font, fill=255)
-                if charging:
-                    draw.text((self.logical_width - 25, self.logical_height - 20), "CHG", font=small_font, fill=255)
+                    # Large percentage (centered)
+                    percentage_text = _fmt_pct(battery_level)
+                    text_width = _text_width(big_font, percentage_text)
+                    x = (self.logical_width - text_width) // 2
+                    self._draw_text(image, (x, 40), percentage_text, big_font)
 
-            else:
-                # Landscape battery layout (original)
-                draw.text((5, 0), "WALL-E BATTERY", font=font, fill=255)
+                    # Vertical battery bar
+                    bar_x, bar_y, bar_width, bar_height = self._layout['battery_bar']
 
-                percentage_text = f"{battery_level}%"
-                bbox = draw.textbbox((0, 0), percentage_text, font=big_font)
-                text_width = bbox[2] - bbox[0]
-                x = (self.logical_width - text_width) // 2
-                draw.text((x, 15), percentage_text, font=big_font, fill=255)
+                    # Battery fill
+                    fill_height = int((battery_level / 100.0) * (bar_height - 2))
+                    if fill_height > 0:
+                        self._fill_rect(image, (bar_x + 1, bar_y + bar_height - 1 - fill_height,
+                                                bar_x + bar_width - 1, bar_y + bar_height - 1))
 
-                # Horizontal battery bar
-                bar_x, bar_y = 10, 42
-                bar_width, bar_height = self.logical_width - 20, 12
+                    # Status
+                    if voltage > 0:
+                        self._draw_text(image, (5, self.logical_height - 20), f"{voltage:.1f}V", small_font)
+                    if charging:
+                        self._draw_text(image, (self.logical_width - 25, self.logical_height - 20), "CHG", small_font)
 
-                self.safe_rectangle(draw, (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
-                                    outline=255, fill=0)
+                else:
+                    # Landscape battery layout (original)
+                    percentage_text = _fmt_pct(battery_level)
+                    text_width = _text_width(big_font, percentage_text)
+                    x = (self.logical_width - text_width) // 2
+                    self._draw_text(image, (x, 15), percentage_text, big_font)
 
-                fill_width = int((battery_level / 100.0) * (bar_width - 2))
-                if fill_width > 0:
-                    self.safe_rectangle(draw,
-                                        (bar_x + 1, bar_y + 1, bar_x + 1 + fill_width, bar_y + bar_height - 1),
-                                        fill=255)
+                    # Horizontal battery bar
+                    bar_x, bar_y, bar_width, bar_height = self._layout['battery_bar']
 
-                # Status
-                if voltage > 0:
-                    draw.text((5, self.logical_height - 10), f"{voltage:.1f}V", font=small_font, fill=255)
-                if charging:
-                    draw.text((self.logical_width - 25, self.logical_height - 10), "CHG", font=small_font, fill=255)
+                    fill_width = int((battery_level / 100.0) * (bar_width - 2))
+                    if fill_width > 0:
+                        self._fill_rect(image, (bar_x + 1, bar_y + 1, bar_x + 1 + fill_width, bar_y + bar_height - 1))
 
-            # Handle rotation for display
-            if self.rotation in [90, 270]:
-                physical_image = Image.new("1", (self.physical_width, self.physical_height))
-                if self.rotation == 90:
-                    rotated_logical = image.transpose(Image.ROTATE_270)
-                else:
-                    rotated_logical = image.transpose(Image.ROTATE_90)
-                physical_image.paste(rotated_logical, (0, 0))
-                final_image = physical_image
-            else:
-                final_image = image
+                    # Status
+                    if voltage > 0:
+                        self._draw_text(image, (5, self.logical_height - 10), f"{voltage:.1f}V", small_font)
+                    if charging:
+                        self._draw_text(image, (self.logical_width - 25, self.logical_height - 10), "CHG", small_font)
 
-            self.display.image(final_image)
-            self.display.show()
+                # Handle rotation for display
+                self._show_image(self._to_physical(image))
+                self._last_render_key = render_key
 
-        except Exception as e:
-            print(f"Error showing battery focus: {e}")
+            except Exception as e:
+                print(f"Error showing battery focus: {e}")
 
     def _show_normal_status(self, walle_state: Dict):
         """Show normal Wall-E status display"""
         try:
-            image = Image.new("1", (self.logical_width, self.logical_height))
-            draw = ImageDraw.Draw(image)
-
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 11)
-                small_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 9)
-            except:
-                font = small_font = ImageFont.load_default()
-
-            # Header
-            draw.text((0, 0), "WALL-E Status", font=font, fill=255)
-            draw.line([(0, 12), (self.logical_width, 12)], fill=255)
-
             # Content - adapt for orientation
             mode = walle_state.get('mode', 'Unknown').title()
             connected = walle_state.get('connected', False)
             status_text = "ONLINE" if connected else "OFFLINE"
             battery_level = walle_state.get('battery_level', 100)
 
-            if self.rotation in [90, 270]:
+            # Sensor distances only appear on the landscape layout
+            portrait = self.rotation in [90, 270]
+            sensor_text = None
+            if not portrait:
+                sensors = walle_state.get('sensors', {})
+                sensor_text = "Sensors: F:%.0f L:%.0f R:%.0f" % (
+                    sensors.get('front', 0), sensors.get('left', 0), sensors.get('right', 0))
+
+            current_time = _format_clock("%H:%M:%S")
+
+            # Nothing visible changed since the last frame
+            render_key = ('status', mode, status_text, battery_level, sensor_text, current_time)
+            if render_key == self._last_render_key:
+                return
+
+            small_font = self._get_font(9)
+
+            last_key = self._last_render_key
+            if last_key is not None and last_key[:-1] == render_key[:-1]:
+                # Only the clock ticked: restore the frame without it and redraw the time
+                image = self._frames['status'][0]
+                image.paste(self._status_base)
+                self._draw_text(image, (0, self.logical_height - 10), current_time, small_font)
+                self._show_image(self._to_physical(image))
+                self._last_render_key = render_key
+                return
+
+            # Start from the static chrome (header, labels, bar outline)
+            image, draw = self._begin_frame('status')
+
+            if portrait:
                 # Portrait layout - stack vertically
-                draw.text((0, 14), f"Mode:", font=small_font, fill=255)
-                draw.text((0, 24), mode, font=small_font, fill=255)
-                draw.text((0, 34), f"Status:", font=small_font, fill=255)
-                draw.text((0, 44), status_text, font=small_font, fill=255)
-                draw.text((0, 54), f"Battery:", font=small_font, fill=255)
-                draw.text((0, 64), f"{battery_level}%", font=small_font, fill=255)
+                self._draw_text(image, (0, 24), mode, small_font)
+                self._draw_text(image, (0, 44), status_text, small_font)
+                self._draw_text(image, (0, 64), _fmt_pct(battery_level), small_font)
 
                 # Vertical battery bar
-                bar_x, bar_y = 10, 80
-                bar_width, bar_height = self.logical_width - 20, 20
-
-                self.safe_rectangle(draw, (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
-                                    outline=255, fill=0)
+                bar_x, bar_y, bar_width, bar_height = self._layout['status_bar']
 
                 fill_height = int((battery_level / 100.0) * (bar_height - 2))
                 if fill_height > 0:
-                    self.safe_rectangle(draw,
-                                        (bar_x + 1, bar_y + bar_height - 1 - fill_height,
-                                         bar_x + bar_width - 1, bar_y + bar_height - 1),
-                                        fill=255)
-
-                # Time at bottom
-                current_time = datetime.now().strftime("%H:%M:%S")
-                draw.text((0, self.logical_height - 10), current_time, font=small_font, fill=255)
+                    self._fill_rect(image, (bar_x + 1, bar_y + bar_height - 1 - fill_height,
+                                            bar_x + bar_width - 1, bar_y + bar_height - 1))
             else:
                 # Landscape layout (original)
-                draw.text((0, 14), f"Mode: {mode}", font=small_font, fill=255)
-                draw.text((0, 24), f"Status: {status_text}", font=small_font, fill=255)
-                draw.text((0, 34), f"Battery: {battery_level}%", font=small_font, fill=255)
+                self._draw_text(image, (0, 14), f"Mode: {mode}", small_font)
+                self._draw_text(image, (0, 24), f"Status: {status_text}", small_font)
+                self._draw_text(image, (0, 34), f"Battery: {battery_level}%", small_font)
 
                 # Battery bar
-                bar_x, bar_y = 70, 36
-                bar_width, bar_height = 52, 6
-
-                self.safe_rectangle(draw, (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
-                                    outline=255, fill=0)
+                bar_x, bar_y, bar_width, bar_height = self._layout['status_bar']
 
                 fill_width = int((battery_level / 100.0) * (bar_width - 2))
                 if fill_width > 0:
-                    self.safe_rectangle(draw,
-                                        (bar_x + 1, bar_y + 1, bar_x + 1 + fill_width, bar_y + bar_height - 1),
-                                        fill=255)
+                    self._fill_rect(image, (bar_x + 1, bar_y + 1, bar_x + 1 + fill_width, bar_y + bar_height - 1))
 
-                # Sensors and time
-                sensors = walle_state.get('sensors', {})
-                front = sensors.get('front', 0)
-                left = sensors.get('left', 0)
-                right = sensors.get('right', 0)
+                # Sensors
+                self._draw_text(image, (0, 44), sensor_text, small_font)
 
-                draw.text((0, 44), f"Sensors: F:{front:.0f} L:{left:.0f} R:{right:.0f}",
-                          font=small_font, fill=255)
+            # Keep everything but the clock for clock-only updates
+            if self._status_base is None:
+                self._status_base = image.copy()
+            else:
+                self._status_base.paste(image)
 
-                current_time = datetime.now().strftime("%H:%M:%S")
-                draw.text((0, 54), current_time, font=small_font, fill=255)
+            # Time at bottom
+            self._draw_text(image, (0, self.logical_height - 10), current_time, small_font)
 
             # Handle rotation for display
-            if self.rotation in [90, 270]:
-                physical_image = Image.new("1", (self.physical_width, self.physical_height))
-                if self.rotation == 90:
-                    rotated_logical = image.transpose(Image.ROTATE_270)
-                else:
-                    rotated_logical = image.transpose(Image.ROTATE_90)
-                physical_image.paste(rotated_logical, (0, 0))
-                final_image = physical_image
-            else:
-                final_image = image
-
-            self.display.image(final_image)
-            self.display.show()
+            self._show_image(self._to_physical(image))
+            self._last_render_key = render_key
 
         except Exception as e:
             print(f"Error showing normal status: {e}")
 
-        def set_display_mode(self, mode: str):
-            """
-            Manually set display mode
+    def set_display_mode(self, mode: str):
+        """
+        Manually set display mode
 
-            Args:
-                mode: 'normal', 'solar', 'battery'
-            """
-            if mode in ['normal', 'solar', 'battery']:
-                self.display_mode = mode
-                print(f"Display mode set to: {mode}")
-            else:
-                print(f"Invalid display mode: {mode}")
+        Args:
+            mode: 'normal', 'solar', 'battery'
+        """
+        if mode in ['normal', 'solar', 'battery']:
+            self.display_mode = mode
+            print(f"Display mode set to: {mode}")
+        else:
+            print(f"Invalid display mode: {mode}")
 
-        def show_solar_animation_sequence(self, battery_level: int = 75, duration: int = 60):
-            """Show animated solar charging sequence"""
-            if not self.available:
-                return
+    def tick_solar_animation(self, frame: int, battery_level: int = 75):
+        """Render a single frame of the solar charging animation without blocking"""
+        if not self.available:
+            return
 
-            for frame in range(duration):
-                self.animation_frame = frame
+        with self._render_lock:
+            self.animation_frame = frame
 
-                # Simulate changing values during animation
-                current_battery = min(100, battery_level + (frame * 0.5))
-                solar_power = 1.0 + 0.5 * math.sin(frame * 0.1)
-                time_to_full = max(0.1, (100 - current_battery) / 10)
+            # Simulate changing values during animation
+            current_battery = min(100, battery_level + (frame * 0.5))
+            solar_power = 1.0 + 0.5 * math.sin(frame * 0.1)
+            time_to_full = max(0.1, (100 - current_battery) / 10)
 
-                self.show_solar_panel_mode(int(current_battery), solar_power, True, time_to_full)
-                time.sleep(0.05)  # 20fps
+            self.show_solar_panel_mode(int(current_battery), solar_power, True, time_to_full)
 
-        def show_message(self, title: str, message: str, duration: Optional[float] = None):
-            """Show a custom message on the display"""
-            if not self.available:
-                return
+    def show_solar_animation_sequence(self, battery_level: int = 75, duration: int = 60):
+        """
+        Show animated solar charging sequence (blocking, 20fps).
+        Holds the render lock throughout, so marked states are drawn
+        once the sequence ends rather than between its frames.
+        """
+        if not self.available:
+            return
 
-            try:
-                # Create image in logical dimensions
-                image = Image.new("1", (self.logical_width, self.logical_height))
-                draw = ImageDraw.Draw(image)
+        with self._render_lock:
+            # Pace against absolute deadlines so render time is not added on top;
+            # when a frame overruns, skip ahead to the frame that is due now
+            # instead of rendering the backlog late
+            frame_period = 1.0 / 20
+            start = time.monotonic()
+            frame = 0
+            while frame < duration:
+                self.tick_solar_animation(frame, battery_level)
+                frame += 1
+                delay = start + frame * frame_period - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    frame += int(-delay / frame_period)
 
-                try:
-                    title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 14)
-                    message_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-                except:
-                    title_font = message_font = ImageFont.load_default()
+    def show_message(self, title: str, message: str, duration: Optional[float] = None):
+        """
+        Show a custom message on the display
 
-                # Center the title
-                title_bbox = draw.textbbox((0, 0), title, font=title_font)
-                title_width = title_bbox[2] - title_bbox[0]
-                title_x = (self.logical_width - title_width) // 2
+        Args:
+            title: Title line
+            message: Message line
+            duration: Seconds to keep the message up before flush() resumes
+                status updates; returns immediately instead of sleeping
+        """
+        if not self.available:
+            return
 
-                draw.text((title_x, 10), title, font=title_font, fill=255)
+        with self._render_lock:
+            self._show_message(title, message, duration)
 
-                # Center the message
-                message_bbox = draw.textbbox((0, 0), message, font=message_font)
-                message_width = message_bbox[2] - message_bbox[0]
-                message_x = (self.logical_width - message_width) // 2
+    def _show_message(self, title: str, message: str, duration: Optional[float]):
+        """Draw a custom message; caller holds _render_lock"""
+        try:
+            # Reuse a blank frame in logical dimensions
+            image, draw = self._begin_frame('message')
 
-                y_pos = 35 if self.rotation not in [90, 270] else 50
-                draw.text((message_x, y_pos), message, font=message_font, fill=255)
+            title_font = self._get_font(14, bold=True)
+            message_font = self._get_font(12)
 
-                # Handle rotation for display
-                if self.rotation in [90, 270]:
-                    physical_image = Image.new("1", (self.physical_width, self.physical_height))
-                    if self.rotation == 90:
-                        rotated_logical = image.transpose(Image.ROTATE_270)
-                    else:
-                        rotated_logical = image.transpose(Image.ROTATE_90)
-                    physical_image.paste(rotated_logical, (0, 0))
-                    final_image = physical_image
-                else:
-                    final_image = image
+            # Center the title
+            title_width = _text_width(title_font, title)
+            title_x = (self.logical_width - title_width) // 2
 
-                self.display.image(final_image)
-                self.display.show()
+            draw.text((title_x, 10), title, font=title_font, fill=255)
 
-                if duration:
-                    time.sleep(duration)
-                    self.clear_display()
+            # Center the message
+            message_width = _text_width(message_font, message)
+            message_x = (self.logical_width - message_width) // 2
 
-            except Exception as e:
-                print(f"Error showing message: {e}")
+            y_pos = 35 if self.rotation not in [90, 270] else 50
+            draw.text((message_x, y_pos), message, font=message_font, fill=255)
 
-        def clear_display(self):
-            """Clear the display"""
-            if self.available:
-                self.display.fill(0)
-                self.display.show()
+            # Handle rotation for display
+            self._show_image(self._to_physical(image))
 
-        def get_display_info(self) -> Dict:
-            """Get display information"""
-            return {
-                'available': self.available,
-                'physical_width': self.physical_width,
-                'physical_height': self.physical_height,
-                'logical_width': self.logical_width,
-                'logical_height': self.logical_height,
-                'rotation': self.rotation,
-                'address': hex(self.address) if self.available else None,
-                'mode': self.display_mode,
-                'animation_frame': self.animation_frame
-            }
+            with self._render_cv:
+                self._message_until = time.monotonic() + duration if duration else 0.0
+                self._render_cv.notify()
 
-        def cleanup(self):
-            """Clean up display resources"""
-            if self.available:
-                self.clear_display()
-                print("Enhanced display controller cleaned up")
+        except Exception as e:
+            print(f"Error showing message: {e}")
+
+    def clear_display(self):
+        """Clear the display"""
+        if self.available:
+            with self._render_lock:
+                # Only the pages that currently have lit pixels are rewritten
+                self._show_frame(bytes(len(self.display.buffer) - 1))
+
+    def get_display_info(self) -> Dict:
+        """Get display information"""
+        return {
+            'available': self.available,
+            'physical_width': self.physical_width,
+            'physical_height': self.physical_height,
+            'logical_width': self.logical_width,
+            'logical_height': self.logical_height,
+            'rotation': self.rotation,
+            'address': hex(self.address) if self.available else None,
+            'mode': self.display_mode,
+            'animation_frame': self.animation_frame
+        }
+
+    def cleanup(self):
+        """Clean up display resources"""
+        if self.available:
+            # Stop the render thread first so it cannot draw over the cleared panel
+            with self._render_cv:
+                self._render_stopped = True
+                self._pending_state = None
+                self._render_cv.notify()
+            if self._render_thread is not None:
+                self._render_thread.join(timeout=2.0)
+                self._render_thread = None
+
+            self.clear_display()
+            print("Enhanced display controller cleaned up")
+
+
+# Test function for standalone testing
+def test_display_controller(frames: int = 1000):
+    """Measure solar-screen render throughput with and without the I2C push"""
+    print("Testing Display Controller...")
+
+    display = EnhancedDisplayController()
+
+    if not display.available:
+        print("No display available for testing")
+        return
+
+    for update_display in (False, True):
+        display.animation_frame = 0
+        start = time.perf_counter()
+        for frame in range(frames):
+            display.show_solar_panel_mode(75, 1.2, True, 2.5, update_display=update_display)
+        elapsed = time.perf_counter() - start
+        label = "render + I2C" if update_display else "render only"
+        print(f"{label}: {elapsed / frames * 1000:.2f} ms/frame ({frames / elapsed:.0f} fps)")
+
+    display.cleanup()
+    print("Display controller test complete")
+
+
+if __name__ == "__main__":
+    test_display_controller()
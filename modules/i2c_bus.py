@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Shared I2C bus settings for the OLED display and the battery ADC
+"""
+
+# I2C bus clock (SSD1306 / ADS1015 fast mode); on a Pi the kernel rate is set
+# by dtparam=i2c_arm_baudrate in /boot/config.txt (see setup_display.py)
+I2C_FREQUENCY = 400000
+
+
+def open_i2c():
+    """Open the I2C bus in fast mode, falling back to the default clock if refused"""
+    # Imported here so the constant stays usable before the libraries are installed
+    import board
+    import busio
+
+    try:
+        return busio.I2C(board.SCL, board.SDA, frequency=I2C_FREQUENCY)
+    except ValueError as e:
+        print(f"I2C at {I2C_FREQUENCY} Hz not supported ({e}), using default speed")
+        return busio.I2C(board.SCL, board.SDA)
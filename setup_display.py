@@ -9,6 +9,8 @@ import sys
 import time
 import os
 
+from modules.i2c_bus import I2C_FREQUENCY
+
 
 def install_packages():
     """Install required packages using pip"""
@@ -211,18 +213,21 @@ def enable_i2c():
 
     config_file = '/boot/config.txt'
     backup_file = '/boot/config.txt.backup'
+    baudrate_line = f'dtparam=i2c_arm_baudrate={I2C_FREQUENCY}'
 
     try:
         # Read current config
         with open(config_file, 'r') as f:
             config = f.read()
 
-        # Check if I2C is already enabled
-        if 'dtparam=i2c_arm=on' in config:
+        missing = [line for line in ('dtparam=i2c_arm=on', baudrate_line) if line not in config]
+
+        # Check if I2C is already enabled at the right speed
+        if not missing:
             print("✓ I2C already enabled in config")
             return True
 
-        print("I2C not enabled. Enabling...")
+        print("I2C not enabled at fast mode. Enabling...")
 
         # Backup original config
         if not os.path.exists(backup_file):
@@ -234,7 +239,8 @@ def enable_i2c():
             f.write(config)
             if not config.endswith('\n'):
                 f.write('\n')
-            f.write('dtparam=i2c_arm=on\n')
+            for line in missing:
+                f.write(line + '\n')
 
         # Apply configuration
         subprocess.run(['sudo', 'cp', '/tmp/i2c_config', config_file], check=True)